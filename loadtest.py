@@ -0,0 +1,293 @@
+"""
+Local load test for the GTD dashboard.
+
+Drives app.py headlessly with Streamlit's AppTest (no browser, no network)
+and replays randomized but realistic interaction traces from many simulated
+sessions at once. For every session count it reports rerun latency
+percentiles, throughput, the load_data cache hit rate and the RSS of each
+worker process.
+
+Each worker process stands in for one replica: its sessions are threads that
+share the replica's st.cache_data, but AppTest swaps process-global runtime
+state for the whole of every run, so reruns inside a replica execute one at a
+time, in the order they were requested. Latency includes the time a rerun
+waits for its turn. Replicas (--processes) run truly in parallel.
+
+Usage:
+    python loadtest.py                          # 1, 2, 4, 8 sessions
+    python loadtest.py --sessions 1 4 16 --steps 30 --processes 2
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+from streamlit import config
+from streamlit.logger import set_log_level
+from streamlit.testing.v1 import AppTest
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(APP_DIR, "app.py")
+
+DIMS_KEYS = ["dims_tree", "dims_par", "dims_bubble", "dims_atk", "dims_splom",
+             "dims_heat", "dims_map", "dims_violin", "dims_sun"]
+
+CHAT_QUESTIONS = [
+    "How many attacks occurred in 2015?",
+    "Which country has the most incidents?",
+    "What was the deadliest year?",
+    "What is the total number of attacks?",
+    "How many died?",
+    "How many attack types exist?",
+    "hello",
+    "show me something interesting",
+]
+
+# (action, weight) — slider drags and filter tweaks dominate real sessions
+ACTIONS = [
+    ("slider", 4),
+    ("countries", 3),
+    ("regions", 2),
+    ("attacks", 2),
+    ("dims", 3),
+    ("chat", 2),
+    ("lang", 1),
+]
+
+
+# -----------------------------
+# SESSION TRACES
+# -----------------------------
+def pick_subset(rng, options):
+    k = rng.randint(1, len(options))
+    return rng.sample(list(options), k)
+
+
+def step(at, rng):
+    """Apply one random interaction to the session; return the reruns it costs."""
+    names, weights = zip(*ACTIONS)
+    action = rng.choices(names, weights=weights)[0]
+
+    if action == "slider":
+        # a drag emits several reruns while one handle moves
+        s = at.slider(key="year_range")
+        lo, hi = s.value
+        handle = rng.choice(["lo", "hi"])
+        reruns = []
+        for _ in range(rng.randint(2, 5)):
+            if handle == "lo":
+                lo = min(max(s.min, lo + rng.randint(-3, 3)), hi)
+            else:
+                hi = max(min(s.max, hi + rng.randint(-3, 3)), lo)
+            reruns.append(lambda lo=lo, hi=hi: at.slider(key="year_range").set_range(lo, hi))
+        return reruns
+
+    if action in ("countries", "regions", "attacks"):
+        key = {"countries": "countries_filter",
+               "regions": "regions_filter",
+               "attacks": "attack_filter"}[action]
+        options = at.multiselect(key=key).options
+        return [lambda: at.multiselect(key=key).set_value(pick_subset(rng, options))]
+
+    if action == "dims":
+        key = rng.choice(DIMS_KEYS)
+        options = at.multiselect(key=key).options
+        return [lambda: at.multiselect(key=key).set_value(pick_subset(rng, options))]
+
+    if action == "chat":
+        question = rng.choice(CHAT_QUESTIONS)
+        return [lambda: at.text_input[0].input(question)]
+
+    lang = rng.choice(["tr", "en"])
+    return [lambda: at.selectbox(key="lang_select").set_value(lang)]
+
+
+class FifoLock:
+    """Lock that hands out turns in arrival order (a plain Lock does not)."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._issued = 0
+        self._serving = 0
+
+    def __enter__(self):
+        with self._cond:
+            ticket = self._issued
+            self._issued += 1
+            self._cond.wait_for(lambda: self._serving == ticket)
+
+    def __exit__(self, *exc):
+        with self._cond:
+            self._serving += 1
+            self._cond.notify_all()
+
+
+# AppTest is not thread-safe (it swaps Runtime._instance and patches config
+# for the whole run), so a replica serves one rerun at a time, first come
+# first served
+RUN_LOCK = FifoLock()
+
+
+def timed_run(at):
+    """Rerun the session's script; return (seconds incl. queueing, ok)."""
+    t0 = time.perf_counter()
+    try:
+        with RUN_LOCK:
+            at.run()
+    except Exception:
+        # AppTest raises RuntimeError once a rerun exceeds its timeout
+        return time.perf_counter() - t0, False
+    return time.perf_counter() - t0, not at.exception
+
+
+def run_session(session_id, steps, seed, timeout):
+    rng = random.Random(seed * 100003 + session_id)
+    latencies = []
+    errors = 0
+    at = None
+
+    for _ in range(steps):
+        if at is None:
+            # (re)open the session; a failed rerun leaves no widgets to drive
+            at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+            seconds, ok = timed_run(at)
+            if not ok:
+                errors += 1
+                at = None
+                continue
+            latencies.append(seconds)
+
+        for interact in step(at, rng):
+            interact()
+            seconds, ok = timed_run(at)
+            if not ok:
+                errors += 1
+                at = None
+                break
+            latencies.append(seconds)
+
+    return latencies, errors
+
+
+# -----------------------------
+# WORKER PROCESS (one dashboard replica)
+# -----------------------------
+def current_rss_mb():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 2**20
+    try:
+        import resource
+    except ImportError:  # Windows without psutil
+        return float("nan")
+    # ru_maxrss is the peak, in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def run_worker(session_ids, steps, seed, timeout):
+    os.chdir(APP_DIR)
+    # keep per-rerun warnings from drowning the report
+    config.set_option("logger.level", "error")
+    set_log_level("error")
+
+    # every load_data cache miss reads the CSV exactly once
+    misses = [0]
+    lock = threading.Lock()
+    read_csv = pd.read_csv
+
+    def counting_read_csv(*args, **kwargs):
+        with lock:
+            misses[0] += 1
+        return read_csv(*args, **kwargs)
+
+    pd.read_csv = counting_read_csv
+
+    with ThreadPoolExecutor(max_workers=len(session_ids)) as pool:
+        results = list(pool.map(
+            lambda sid: run_session(sid, steps, seed, timeout), session_ids
+        ))
+
+    latencies = [x for lat, _ in results for x in lat]
+    errors = sum(err for _, err in results)
+    return {
+        "pid": os.getpid(),
+        "latencies": latencies,
+        "errors": errors,
+        "misses": misses[0],
+        "rss_mb": current_rss_mb(),
+    }
+
+
+# -----------------------------
+# DRIVER
+# -----------------------------
+def run_level(n_sessions, n_processes, steps, seed, timeout):
+    n_processes = min(n_processes, n_sessions)
+    shards = [list(range(i, n_sessions, n_processes)) for i in range(n_processes)]
+
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=n_processes) as pool:
+        workers = list(pool.map(
+            run_worker, shards,
+            [steps] * n_processes, [seed] * n_processes, [timeout] * n_processes
+        ))
+    wall = time.perf_counter() - t0
+
+    # latencies only hold reruns that completed, i.e. that reached load_data
+    lat_ms = pd.Series([x for w in workers for x in w["latencies"]], dtype=float) * 1000
+    reruns = len(lat_ms)
+    misses = sum(w["misses"] for w in workers)
+    return {
+        "sessions": n_sessions,
+        "reruns": reruns,
+        "errors": sum(w["errors"] for w in workers),
+        "throughput": reruns / wall,
+        "p50": lat_ms.quantile(0.50),
+        "p95": lat_ms.quantile(0.95),
+        "p99": lat_ms.quantile(0.99),
+        "cache_hit": max(0.0, 1 - misses / reruns) if reruns else 0.0,
+        "rss_mb": [w["rss_mb"] for w in workers],
+    }
+
+
+def positive_int(value):
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the GTD dashboard.")
+    parser.add_argument("--sessions", type=positive_int, nargs="+", default=[1, 2, 4, 8],
+                        help="concurrent session counts to test")
+    parser.add_argument("--processes", type=positive_int, default=1,
+                        help="worker processes (replicas) sessions are spread over")
+    parser.add_argument("--steps", type=positive_int, default=20,
+                        help="interactions replayed per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60,
+                        help="seconds allowed per rerun")
+    args = parser.parse_args(argv)
+
+    print(f"{'sessions':>8} {'reruns':>7} {'err':>4} {'rerun/s':>8} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'cache':>6}  rss MB")
+    for n in args.sessions:
+        r = run_level(n, args.processes, args.steps, args.seed, args.timeout)
+        print(f"{r['sessions']:>8} {r['reruns']:>7} {r['errors']:>4} "
+              f"{r['throughput']:>8.2f} {r['p50']:>8.0f} {r['p95']:>8.0f} "
+              f"{r['p99']:>8.0f} {r['cache_hit']:>6.1%}  "
+              f"{', '.join(f'{mb:.0f}' for mb in r['rss_mb'])}")
+
+
+if __name__ == "__main__":
+    main()